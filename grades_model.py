@@ -0,0 +1,74 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class GradesModel(QAbstractTableModel):
+    """
+        Table model holding the rows shown in the output table.
+
+        The rows are kept as plain Python tuples of strings, one value per column, and the view reads cells from them
+        only when it paints them.
+
+       Attributes:
+           headers (tuple): The horizontal header labels of the table.
+       """
+    headers: tuple[str, ...] = ('Attempt', 'Score', 'Grade', 'Best', 'Average', 'Low')
+
+    def __init__(self, parent=None) -> None:
+        """
+            Initializes the model with no rows.
+
+            Args:
+                parent (QObject): The parent object of the model.
+        """
+        super().__init__(parent)
+        self.rows: list[tuple[str, ...]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+            Returns the number of rows in the table.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+            Returns the number of columns in the table.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> str | None:
+        """
+            Returns the text of a cell.
+
+            Args:
+                index (QModelIndex): The cell requested by the view.
+                role (int): The data role requested by the view.
+
+            Returns:
+                str: The cell text for the display role, otherwise None.
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.rows[index.row()][index.column()]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> str | None:
+        """
+            Returns the horizontal header labels, and the default row numbers for the vertical header.
+        """
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows: list[tuple[str, ...]]) -> None:
+        """
+            Replaces all rows of the table.
+
+            Args:
+                rows (list[tuple[str, ...]]): The new rows, each with one string per column.
+        """
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
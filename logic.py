@@ -2,9 +2,35 @@ from PyQt6.QtWidgets import *
 from PyQt6.QtCore import QRegularExpression, QTimer
 from PyQt6.QtGui import QRegularExpressionValidator
 from grade_app import *
+from grades_model import GradesModel
 import csv
+import functools
+import io
 import os
 
+_NAME_VALIDATOR = QRegularExpressionValidator(QRegularExpression("[a-zA-Z'-]+"))
+_ATTEMPTS_VALIDATOR = QRegularExpressionValidator(QRegularExpression("[1-4]"))
+_SCORE_VALIDATOR = QRegularExpressionValidator(QRegularExpression("[0-9]+"))
+
+
+@functools.lru_cache(maxsize=32)
+def _summary(scores: tuple[int, ...]) -> tuple[str, str, str]:
+    """
+        Calculates the average, best, and lowest scores for a tuple of scores.
+
+        Args:
+            scores (tuple[int, ...]): The scores to summarize.
+
+        Returns:
+            tuple: A tuple containing the average score, best score, and lowest score as strings.
+    """
+    average = sum(scores) / len(scores)
+    avg_score = "%.2f" % average
+    best_score = "%d" % max(scores)
+    low_score = "%d" % min(scores)
+
+    return avg_score, best_score, low_score
+
 
 class Logic(QMainWindow, Ui_MainWindow):
     """
@@ -18,64 +44,126 @@ class Logic(QMainWindow, Ui_MainWindow):
            csv_file (str): The name of the CSV file where data is saved.
            error_message_color (str): CSS style for error messages.
            success_message_color (str): CSS style for success messages.
+           attempts_debounce_ms (int): Delay before the score fields are updated after the number of attempts changes.
+           csv_flush_ms (int): Delay used to group saved rows into a single write to the CSV file.
+           grade_table (tuple): Letter grade for each score divided by 10, from 0 to 100.
        """
     csv_file: str = 'grades.csv'
     error_message_color: str = "color: red;"
     success_message_color: str = "color: green;"
+    attempts_debounce_ms: int = 75
+    csv_flush_ms: int = 200
+    grade_table: tuple[str, ...] = ('F', 'F', 'F', 'F', 'F', 'F', 'D', 'C', 'B', 'A', 'A')
 
     def __init__(self) -> None:
         """
             Initializes the Logic class, sets up the UI, and connects buttons.
 
-            This method sets up the user interface, make a list of score_inputs & labels, hide fields until number of
-            attempts is entered and connects button click events to their respective methods.
+            This method sets up the user interface, make a list of score_inputs & labels and a tuple pairing them, opens
+            the CSV file if it already exists, hide fields until number of attempts is entered and connects button
+            click events to their respective methods.
         """
         super().__init__()
         self.setupUi(self)
 
         self.score_inputs: list = [self.score_one_input, self.score_two_input, self.score_three_input, self.score_four_input]
         self.score_labels: list = [self.score_one_label, self.score_two_label, self.score_three_label, self.score_four_label]
+        self.score_pairs: tuple = tuple(zip(self.score_inputs, self.score_labels))
+        self.last_num_attempts: int = 0
+
+        self.attempts_timer = QTimer(self)
+        self.attempts_timer.setSingleShot(True)
+        self.attempts_timer.setInterval(self.attempts_debounce_ms)
+        self.attempts_timer.timeout.connect(self.update_attempt_fields)
+
+        self.csv_handle = None
+        if os.path.exists(self.csv_file):
+            self.open_csv()
+        self.pending_rows: list = []
+
+        self.csv_flush_timer = QTimer(self)
+        self.csv_flush_timer.setSingleShot(True)
+        self.csv_flush_timer.setInterval(self.csv_flush_ms)
+        self.csv_flush_timer.timeout.connect(self.flush_csv)
+
+        self.message_timer = QTimer(self)
+        self.message_timer.setSingleShot(True)
+        self.message_timer.setInterval(5000)
+        self.message_timer.timeout.connect(self.message_label.clear)
 
         self.hide_fields()
         self.set_validator()
+        self.set_table_model()
         self.connect_buttons()
 
     def set_validator(self) -> None:
         """
             Sets input validators for the name, attempts, and score fields.
 
-            This method applies regular expression validators to ensure that the user inputs are the valid ones.
+            This method applies regular expression validators to ensure that the user inputs are the valid ones. The
+            validators are built once at import and shared by every window.
         """
-        names_validator = QRegularExpressionValidator(QRegularExpression("[a-zA-Z'-]+"))
-        self.first_name_input.setValidator(names_validator)
-        self.last_name_input.setValidator(names_validator)
+        self.first_name_input.setValidator(_NAME_VALIDATOR)
+        self.last_name_input.setValidator(_NAME_VALIDATOR)
 
-        attempts_input_validator = QRegularExpressionValidator(QRegularExpression("[1-4]"))
-        self.attempts_input.setValidator(attempts_input_validator)
+        self.attempts_input.setValidator(_ATTEMPTS_VALIDATOR)
 
-        score_input_validator = QRegularExpressionValidator(QRegularExpression("[0-9]+"))
         for score_input in self.score_inputs:
-            score_input.setValidator(score_input_validator)
+            score_input.setValidator(_SCORE_VALIDATOR)
             score_input.setMaxLength(3)
 
+    def set_table_model(self) -> None:
+        """
+            Replaces the generated table widget with a table view backed by the grades model.
+
+            The view copies the geometry, font and style of table_widget_to_output from grade_app.py, so the generated
+            file can still be rebuilt from the .ui file. The model provides the columns and header labels, so later
+            outputs only have to replace its rows.
+        """
+        table_widget = self.table_widget_to_output
+        self.table_view_to_output = QTableView(parent=self.centralwidget)
+        self.table_view_to_output.setGeometry(table_widget.geometry())
+        self.table_view_to_output.setMinimumSize(table_widget.minimumSize())
+        self.table_view_to_output.setMaximumSize(table_widget.maximumSize())
+        self.table_view_to_output.setFont(table_widget.font())
+        self.table_view_to_output.setStyleSheet(table_widget.styleSheet())
+        self.table_view_to_output.setObjectName("table_view_to_output")
+
+        table_widget.hide()
+        table_widget.deleteLater()
+        del self.table_widget_to_output
+
+        self.grades_model = GradesModel(self)
+        self.table_view_to_output.setModel(self.grades_model)
+
     def connect_buttons(self) -> None:
         """
             Connects button click events to their respective methods.
 
             This function links the UI buttons to their corresponding functions to handle user interactions. It also
-            clears the message_label if user changes the input.
+            clears the message_label if user changes the input. Updates to the score fields are debounced so only the
+            last keystroke in the attempts field shows or hides them.
         """
         self.save_button.clicked.connect(self.save_to_csv)
         self.output_button.clicked.connect(self.output_current_data)
-        self.attempts_input.textChanged.connect(self.update_attempt_fields)
+        self.attempts_input.textChanged.connect(self.attempts_changed)
         self.clear_button.clicked.connect(self.clear_form)
 
         self.first_name_input.textChanged.connect(self.clear_message)
         self.last_name_input.textChanged.connect(self.clear_message)
-        self.attempts_input.textChanged.connect(self.clear_message)
         for score_input in self.score_inputs:
             score_input.textChanged.connect(self.clear_message)
 
+    def attempts_changed(self) -> None:
+        """
+            Handles a change in the attempts field.
+
+            This method clears the message label and restarts the debounce timer for update_attempt_fields, so the
+            attempts field only needs a single textChanged connection.
+        """
+        self.clear_message()
+        self.attempts_timer.start()
+
     def hide_fields(self) -> None:
         """
             Hides score input fields and labels.
@@ -83,140 +171,247 @@ class Logic(QMainWindow, Ui_MainWindow):
             This method is used to clear and hide score labels and fields hidden until the number of attempts is updated
             or when the form is cleared.
         """
-        for score_input in self.score_inputs:
+        for score_input, label in self.score_pairs:
             score_input.clear()
             score_input.hide()
-        for label in self.score_labels:
             label.hide()
+        self.last_num_attempts = 0
 
     def update_attempt_fields(self) -> None:
         """
             Updates the visibility of score input fields based on the number of attempts.
 
             This method shows or hides the score input fields and labels according to the number of attempts specified
-            by the user.
+            by the user. Nothing is done if the fields already match that number.
         """
         try:
             num_attempts = int(self.attempts_input.text())
             if not 1 <= num_attempts <= 4:
                 raise ValueError
         except ValueError:
-            self.hide_fields()
+            if self.last_num_attempts:
+                self.hide_fields()
+            return
+
+        if num_attempts == self.last_num_attempts:
             return
 
-        for i in range(4):
+        for i, (score_input, label) in enumerate(self.score_pairs):
             if i < num_attempts:
-                self.score_inputs[i].show()
-                self.score_labels[i].show()
+                score_input.show()
+                label.show()
             else:
-                self.score_inputs[i].hide()
-                self.score_labels[i].hide()
+                score_input.hide()
+                label.hide()
+        self.last_num_attempts = num_attempts
 
     def validate_inputs(self) -> tuple[str | None, str | None, int | None, list[int] | None]:
         """
             Validates user inputs for first name, last name, attempts, and scores.
 
+            The score fields only accept digits (see set_validator), so their text is converted with int() directly and
+            only the 0-100 range is checked.
+
             Returns:
                 tuple: A tuple containing the first name, last name, number of attempts, and a list of scores.
                 If any input is invalid, returns None.
         """
+        show_message = self.show_message
+        error_color = self.error_message_color
+
         first_name = self.first_name_input.text()
         if not first_name:
-            self.show_message("Please provide the first name", self.error_message_color)
+            show_message("Please provide the first name", error_color)
             return None, None, None, None
 
         last_name = self.last_name_input.text()
         if not last_name:
-            self.show_message("Please provide the last name", self.error_message_color)
+            show_message("Please provide the last name", error_color)
             return None, None, None, None
 
-        num_attempts = self.attempts_input.text()
-        if not num_attempts:
-            self.show_message("Please enter the number of attempts", self.error_message_color)
+        attempts_text = self.attempts_input.text()
+        if not attempts_text:
+            show_message("Please enter the number of attempts", error_color)
             return None, None, None, None
 
-        num_attempts = int(self.attempts_input.text())
+        num_attempts = int(attempts_text)
+        score_texts = [score_input.text() for score_input in self.score_inputs[:num_attempts]]
 
         scores = []
-        for i in range(num_attempts):
-            score_text = self.score_inputs[i].text()
+        for i, score_text in enumerate(score_texts, 1):
             if not score_text:
-                self.show_message(f"Please enter a score for attempt {i + 1}", self.error_message_color)
+                show_message(f"Please enter a score for attempt {i}", error_color)
                 return None, None, None, None
 
-            try:
-                score = int(score_text)
-                if not (0 <= score <= 100):
-                    self.show_message(f"Invalid score for attempt {i + 1}. Score must be between 0 and 100.", self.error_message_color)
-                    return None, None, None, None
-                scores.append(score)
-
-            except ValueError:
-                self.show_message(f"Invalid score for attempt {i + 1}. Please enter a valid number.", self.error_message_color)
+            score = int(score_text)
+            if not (0 <= score <= 100):
+                show_message(f"Invalid score for attempt {i}. Score must be between 0 and 100.", error_color)
                 return None, None, None, None
+            scores.append(score)
 
         return first_name, last_name, num_attempts, scores
 
-    def scores_summary(self) -> tuple[str, str, str] | None:
+    def scores_summary(self, scores: list[int]) -> tuple[str, str, str]:
         """
             Calculates and returns the average, best, and lowest scores.
 
+            Args:
+                scores (list[int]): The validated scores returned by validate_inputs.
+
             Returns:
-                tuple: A tuple containing the average score, best score, and lowest score as strings. Returns
-                None if input validation fails.
+                tuple: A tuple containing the average score, best score, and lowest score as strings.
         """
-        first_name, last_name, num_attempts, scores = self.validate_inputs()
-        if scores is None:
+        return _summary(tuple(scores))
+
+    def open_csv(self) -> bool:
+        """
+            Opens the CSV file for appending and keeps the handle for later saves.
+
+            This method is called from __init__ when the file already exists, otherwise from the first flush_csv, so
+            launching the app does not create the file. If the file does not exist, it creates it and writes the
+            headers. Errors are shown in the message label.
+
+            Returns:
+                bool: True if the file is open, False if it could not be opened.
+        """
+        headers = ['First Name', 'Last Name', 'Attempt 1', 'Attempt 2', 'Attempt 3',
+                   'Attempt 4', 'Best', 'Average', 'Low']
+
+        try:
+            write_headers = not os.path.exists(self.csv_file)
+            self.csv_handle = open(self.csv_file, 'a', newline='', buffering=8192)
+            if write_headers:
+                self.write_csv_rows([headers])
+
+        except OSError as e:
+            self.discard_csv()
+            self.show_message(f"Failed to open {self.csv_file}: {e}", self.error_message_color)
+            return False
+
+        return True
+
+    def write_csv_rows(self, rows: list[list]) -> None:
+        """
+            Writes rows to the open CSV file with a single write and flush.
+
+            The rows are formatted in memory first, so nothing is left in the file buffer if the write fails.
+
+            Args:
+                rows (list[list]): The rows to write.
+
+            Raises:
+                OSError: If the rows could not be written to the file.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        self.csv_handle.write(buffer.getvalue())
+        self.csv_handle.flush()
+
+    def discard_csv(self) -> None:
+        """
+            Closes the CSV file without writing what is left in its buffer.
+
+            This method is called after a failed write, so rows that are still queued are not written a second time
+            when the file is reopened by the next flush_csv.
+        """
+        if self.csv_handle is None:
+            return
+
+        handle = self.csv_handle
+        self.csv_handle = None
+        try:
+            handle.buffer.raw.close()
+        except OSError:
+            pass
+        try:
+            handle.close()
+        except (OSError, ValueError):
+            pass
+
+    def flush_csv(self) -> None:
+        """
+            Writes the rows queued by save_to_csv to the CSV file.
+
+            The success message is only shown once the rows are written. Rows stay queued if the write fails so the
+            next flush can retry them, and the error stays visible until the user edits the form.
+        """
+        if not self.pending_rows:
+            return
+
+        if self.csv_handle is None and not self.open_csv():
+            self.message_timer.stop()
+            return
+
+        try:
+            self.write_csv_rows(self.pending_rows)
+
+        except OSError as e:
+            self.discard_csv()
+            self.message_timer.stop()
+            self.show_message(f"Failed to save: {e}", self.error_message_color)
             return
 
-        average = sum(scores) / len(scores)
-        avg_score = f"{average:.2f}"
-        best_score = str(max(scores))
-        low_score = str(min(scores))
+        self.pending_rows.clear()
+        self.show_message(f"Data saved to {self.csv_file}!", self.success_message_color)
+        self.message_timer.start()
+
+    def close_csv(self) -> None:
+        """
+            Closes the CSV file if it is still open.
 
-        return avg_score, best_score, low_score
+            This method is called from closeEvent, which Qt also sends when the application quits, after the queued
+            rows have been written or discarded. Every write is flushed, so closing never writes rows again and never
+            raises.
+        """
+        if self.csv_handle is None:
+            return
+
+        handle = self.csv_handle
+        self.csv_handle = None
+        try:
+            handle.close()
+        except OSError:
+            pass
+
+    def grade_scores(self, scores: list[int]) -> list[str]:
+        """
+            Returns the letter grade for each score.
+
+            Args:
+                scores (list[int]): Scores between 0 and 100.
+
+            Returns:
+                list[str]: The letter grades, in the same order as the scores.
+        """
+        grade_table = self.grade_table
+        return [grade_table[score // 10] for score in scores]
 
     def save_to_csv(self) -> None:
         """
             Saves the validated input data to a CSV file.
 
             This method writes the first name, last name, scores, and calculated statistics (best, average, low)
-            to a CSV file. If the file does not exist, it creates it and writes the headers.
+            to a CSV file. The row is queued and the form is cleared; flush_csv writes queued rows together shortly
+            after and reports whether the save succeeded.
         """
         first_name, last_name, num_attempts, scores = self.validate_inputs()
 
         if first_name is None or last_name is None or num_attempts is None or scores is None:
             return
 
-        headers = ['First Name', 'Last Name', 'Attempt 1', 'Attempt 2', 'Attempt 3',
-                   'Attempt 4', 'Best', 'Average', 'Low']
-
-        avg_score, best_score, low_score = self.scores_summary()
+        avg_score, best_score, low_score = self.scores_summary(scores)
 
         attempts_filled = scores + ['NA'] * (4 - num_attempts)
         row = [first_name, last_name] + attempts_filled + [best_score, avg_score, low_score]
 
-        try:
-            if not os.path.exists(self.csv_file):
-                with open(self.csv_file, 'w', newline='') as file:
-                    writer = csv.writer(file)
-                    writer.writerow(headers)
+        self.pending_rows.append(row)
+        self.csv_flush_timer.start()
 
-            with open(self.csv_file, 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(row)
-
-            self.clear_form()
-
-            self.show_message(f"Data saved to grades.csv!", self.success_message_color)
-            QTimer.singleShot(5000, self.message_label.clear)
-
-        except Exception as e:
-            QMessageBox.warning(self, " Save Error", f"Failed to save: {e}")
+        self.clear_form()
 
     def output_current_data(self) -> None:
         """
-            Outputs the current data to a table widget.
+            Outputs the current data to the table view.
 
             This method retrieves the validated input data, calculates grades based on scores, and displays the results
             in a table format within the UI.
@@ -226,37 +421,14 @@ class Logic(QMainWindow, Ui_MainWindow):
         if first_name is None or last_name is None or num_attempts is None or scores is None:
             return
 
-        avg_score, best_score, low_score = self.scores_summary()
-
-        grades = []
-        for score in scores:
-            if score >= 90:
-                grades.append('A')
-            elif score >= 80:
-                grades.append('B')
-            elif score >= 70:
-                grades.append('C')
-            elif score >= 60:
-                grades.append('D')
-            else:
-                grades.append('F')
-
-        self.table_widget_to_output.setRowCount(0)
-        self.table_widget_to_output.setColumnCount(6)
-        self.table_widget_to_output.setHorizontalHeaderLabels(['Attempt', 'Score', 'Grade', 'Best', 'Average', 'Low'])
+        avg_score, best_score, low_score = self.scores_summary(scores)
 
-        for i in range(num_attempts):
-            row_position = self.table_widget_to_output.rowCount()
-            self.table_widget_to_output.insertRow(row_position)
-            self.table_widget_to_output.setItem(row_position, 0, QTableWidgetItem(f"Attempt {i + 1}"))
-            self.table_widget_to_output.setItem(row_position, 1, QTableWidgetItem(str(scores[i])))
-            self.table_widget_to_output.setItem(row_position, 2, QTableWidgetItem(grades[i]))
+        grades = self.grade_scores(scores)
 
-        row_position = self.table_widget_to_output.rowCount()
-        self.table_widget_to_output.insertRow(row_position)
-        self.table_widget_to_output.setItem(row_position, 3, QTableWidgetItem(best_score))
-        self.table_widget_to_output.setItem(row_position, 4, QTableWidgetItem(avg_score))
-        self.table_widget_to_output.setItem(row_position, 5, QTableWidgetItem(low_score))
+        rows = [(f"Attempt {row + 1}", str(score), grade, '', '', '')
+                for row, (score, grade) in enumerate(zip(scores, grades))]
+        rows.append(('', '', '', best_score, avg_score, low_score))
+        self.grades_model.set_rows(rows)
 
     def show_message(self, text: str, color: str) -> None:
         """
@@ -279,7 +451,7 @@ class Logic(QMainWindow, Ui_MainWindow):
 
     def clear_form(self) -> None:
         """
-            Clears all input fields and resets the table widget.
+            Clears all input fields and removes the rows from the table view.
 
             This method is called to reset the form, clearing all inputs and hiding any displayed scores or labels.
         """
@@ -290,7 +462,31 @@ class Logic(QMainWindow, Ui_MainWindow):
 
         self.hide_fields()
 
-        self.table_widget_to_output.setRowCount(0)
-        self.table_widget_to_output.setColumnCount(0)
+        self.grades_model.set_rows([])
 
         self.first_name_input.setFocus()
+
+    def closeEvent(self, event) -> None:
+        """
+            Writes any queued rows and closes the CSV file before the window closes.
+
+            If the queued rows cannot be written, the user is asked whether to discard them. Otherwise the window stays
+            open so the save can be retried.
+
+            Args:
+                event (QCloseEvent): The close event sent by Qt.
+        """
+        self.csv_flush_timer.stop()
+        self.flush_csv()
+
+        if self.pending_rows:
+            answer = QMessageBox.question(self, "Unsaved Data",
+                                          f"{len(self.pending_rows)} row(s) could not be saved to {self.csv_file}. "
+                                          f"Discard them and close?")
+            if answer != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+            self.pending_rows.clear()
+
+        self.close_csv()
+        super().closeEvent(event)